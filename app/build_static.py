@@ -0,0 +1,96 @@
+# app/build_static.py
+"""
+Build content-hashed, precompressed copies of the static assets.
+
+Usage (run once per deploy, before starting the server):
+    python -m app.build_static
+
+Writes static/dist/<asset>.<hash>.<ext> plus .gz and .br variants and a
+manifest.json mapping each source asset to its hashed build. The last
+KEEP_BUILDS builds of each asset are kept so pages rendered by a previous
+deploy can still load their CSS / JS during a rollout.
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+from app.services.static_assets import DIST_DIR, MANIFEST_NAME, STATIC_DIR
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; only gzip variants are built without it
+    brotli = None
+
+ASSETS = ["css/styles.css", "js/app.js"]
+KEEP_BUILDS = 3
+
+
+def build_asset(name: str, static_dir: Path = STATIC_DIR) -> str:
+    """Write the hashed and compressed variants of one asset and return its dist path."""
+    source = static_dir / name
+    data = source.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()[:12]
+
+    relative = Path(DIST_DIR) / Path(name).with_suffix(f".{digest}{source.suffix}")
+    target = static_dir / relative
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(data)
+
+    # mtime=0 keeps the gzip output byte-identical across builds
+    target.with_name(target.name + ".gz").write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        target.with_name(target.name + ".br").write_bytes(brotli.compress(data, quality=11))
+
+    return relative.as_posix()
+
+
+def prune_builds(name: str, static_dir: Path = STATIC_DIR, keep: int = KEEP_BUILDS) -> list[Path]:
+    """Delete all but the `keep` most recent hashed builds of an asset and return what was removed."""
+    source = Path(name)
+    build_dir = static_dir / DIST_DIR / source.parent
+    pattern = re.compile(rf"^{re.escape(source.stem)}\.[0-9a-f]{{12}}{re.escape(source.suffix)}$")
+
+    builds = sorted(
+        (p for p in build_dir.glob(f"{source.stem}.*{source.suffix}") if pattern.match(p.name)),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True,
+    )
+
+    removed = []
+    for old in builds[keep:]:
+        for path in (old, old.with_name(old.name + ".gz"), old.with_name(old.name + ".br")):
+            if path.exists():
+                path.unlink()
+                removed.append(path)
+    return removed
+
+
+def build(static_dir: Path = STATIC_DIR, keep: int = KEEP_BUILDS) -> dict:
+    """Build every asset, prune old builds and write the manifest."""
+    manifest = {}
+    for name in ASSETS:
+        manifest[name] = build_asset(name, static_dir)
+        prune_builds(name, static_dir, keep)
+
+    # Write-then-rename so a server starting mid-build never reads a partial manifest
+    manifest_path = static_dir / DIST_DIR / MANIFEST_NAME
+    tmp_path = manifest_path.with_name(MANIFEST_NAME + ".tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(tmp_path, manifest_path)
+    return manifest
+
+
+def main() -> int:
+    manifest = build()
+    if brotli is None:
+        print("[BUILD_STATIC] brotli not installed, only gzip variants were built.")
+    for name, built in manifest.items():
+        print(f"{name} -> {built}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,11 +1,18 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Request
+import gzip
+import hashlib
+from typing import Optional
+
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request, Response
+from fastapi.responses import FileResponse, HTMLResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.templating import Jinja2Templates
-from fastapi.staticfiles import StaticFiles
 
 from app.schemas import EmailTextRequest, EmailAnalysisResponse
 from app.services.ai_client import classify_and_reply
+from app.services.profiling import PROFILE_HEADER, is_authorized, profile_path, profile_request
+from app.services.static_assets import PrecompressedStaticFiles, accepted_encodings, asset_url
 from app.services.text_extractor import extract_text_from_txt, extract_text_from_pdf
+from app.services.traffic_capture import CAPTURE_ENABLED, TrafficCaptureMiddleware
 
 
 app = FastAPI(
@@ -16,9 +23,13 @@ app = FastAPI(
 
 # HTML templates (landing page)
 templates = Jinja2Templates(directory="templates")
+templates.env.globals["asset_url"] = asset_url
+
+# Static assets (CSS / JS), served precompressed when `python -m app.build_static` was run
+app.mount("/static", PrecompressedStaticFiles(directory="static"), name="static")
 
-# Static assets (CSS / JS)
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Rendered landing page (body, gzip body, content hash), built on first hit
+_landing_page: Optional[tuple[bytes, bytes, str]] = None
 
 # CORS (open for local dev; restrict origins in production)
 app.add_middleware(
@@ -29,13 +40,38 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Sampled traffic capture for replay load tests (opt-in via TRAFFIC_CAPTURE_ENABLED)
+if CAPTURE_ENABLED:
+    app.add_middleware(TrafficCaptureMiddleware)
+
 
 @app.get("/", include_in_schema=False)
 def home(request: Request):
     """
     Render the HTML landing page with the classifier UI.
+    The page is static, so it is rendered once and revalidated via ETag.
     """
-    return templates.TemplateResponse("index.html", {"request": request})
+    global _landing_page
+    if _landing_page is None:
+        body = templates.get_template("index.html").render({"request": request}).encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()[:16]
+        _landing_page = (body, gzip.compress(body, mtime=0), digest)
+
+    body, gzipped, digest = _landing_page
+    use_gzip = "gzip" in accepted_encodings(request.headers.get("accept-encoding", ""))
+
+    # Each content-coding is a distinct representation and needs its own strong ETag
+    etag = f'"{digest}-gz"' if use_gzip else f'"{digest}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+
+    if_none_match = [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]
+    if "*" in if_none_match or etag in (tag.removeprefix("W/") for tag in if_none_match):
+        return Response(status_code=304, headers=headers)
+
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return HTMLResponse(gzipped, headers=headers)
+    return HTMLResponse(body, headers=headers)
 
 
 @app.get("/health")
@@ -47,37 +83,50 @@ def health_check():
 
 
 @app.post("/analyze-text", response_model=EmailAnalysisResponse)
-def analyze_text(payload: EmailTextRequest):
+def analyze_text(payload: EmailTextRequest, request: Request, response: Response):
     """
     Analyze raw email text and return classification and suggested reply.
     """
-    result = classify_and_reply(payload.text)
+    with profile_request(request, response):
+        result = classify_and_reply(payload.text)
     return result
 
 
 @app.post("/analyze-file", response_model=EmailAnalysisResponse)
-async def analyze_file(file: UploadFile = File(...)):
+async def analyze_file(request: Request, response: Response, file: UploadFile = File(...)):
     """
     Analyze a .txt or .pdf file: extract text, classify, and suggest a reply.
     """
-    filename = (file.filename or "").lower()
-    content_type = (file.content_type or "").lower()
-
-    if filename.endswith(".txt") or "text/plain" in content_type:
-        text = extract_text_from_txt(file.file)
-    elif filename.endswith(".pdf") or "pdf" in content_type:
-        text = extract_text_from_pdf(file.file)
-    else:
-        raise HTTPException(
-            status_code=400,
-            detail="Unsupported file type. Please upload a .txt or .pdf file.",
-        )
-
-    if not text.strip():
-        raise HTTPException(
-            status_code=400,
-            detail="Could not extract text from the uploaded file.",
-        )
-
-    result = classify_and_reply(text)
-    return result
+    with profile_request(request, response):
+        filename = (file.filename or "").lower()
+        content_type = (file.content_type or "").lower()
+
+        if filename.endswith(".txt") or "text/plain" in content_type:
+            text = extract_text_from_txt(file.file)
+        elif filename.endswith(".pdf") or "pdf" in content_type:
+            text = extract_text_from_pdf(file.file)
+        else:
+            raise HTTPException(
+                status_code=400,
+                detail="Unsupported file type. Please upload a .txt or .pdf file.",
+            )
+
+        if not text.strip():
+            raise HTTPException(
+                status_code=400,
+                detail="Could not extract text from the uploaded file.",
+            )
+
+        result = classify_and_reply(text)
+        return result
+
+
+@app.get("/debug/profiles/{profile_id}", include_in_schema=False)
+def download_profile(profile_id: str, request: Request):
+    """
+    Download the cProfile stats of a profiled request (admin only).
+    """
+    path = profile_path(profile_id) if is_authorized(request.headers.get(PROFILE_HEADER)) else None
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found.")
+    return FileResponse(path, media_type="application/octet-stream", filename=path.name)
@@ -0,0 +1,235 @@
+# app/replay.py
+"""
+Replay captured traffic against a running server and report capacity metrics.
+
+Usage:
+    python -m app.replay captures/traffic.jsonl --base-url http://localhost:8000 \\
+        --speed 2.0 --concurrency 16
+"""
+import argparse
+import json
+import math
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+
+def load_records(capture_path: Path) -> list[dict]:
+    """Load captured records sorted by their original arrival time."""
+    records = []
+    with capture_path.open(encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if line:
+                records.append(json.loads(line))
+    records.sort(key=lambda r: r.get("ts", 0))
+    return records
+
+
+def _build_request(record: dict, base_url: str, capture_dir: Path) -> urllib.request.Request:
+    """Rebuild the HTTP request described by a captured record."""
+    url = base_url.rstrip("/") + record["endpoint"]
+
+    if "file" in record:
+        body = (capture_dir / record["file"]).read_bytes()
+        content_type = record.get("content_type") or "application/octet-stream"
+    elif "body" in record:
+        body = record["body"].encode("utf-8")
+        content_type = record.get("content_type") or "application/json"
+    else:
+        # Older captures only kept the extracted text
+        body = json.dumps({"text": record.get("text", "")}).encode("utf-8")
+        content_type = "application/json"
+
+    return urllib.request.Request(
+        url, data=body, method="POST", headers={"Content-Type": content_type}
+    )
+
+
+def _send(request: urllib.request.Request, timeout: float, scheduled: float) -> dict:
+    """
+    Send one request and return its status, latency and parsed result.
+    Latency is measured from the scheduled send time, so time spent
+    queued behind busy workers is included.
+    """
+    status: Optional[int] = None
+    result: dict = {}
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as resp:
+            status = resp.status
+            body = resp.read()
+        try:
+            parsed = json.loads(body or b"{}")
+            result = parsed if isinstance(parsed, dict) else {}
+        except ValueError:
+            result = {}
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except Exception:
+        status = None
+    latency_ms = (time.perf_counter() - scheduled) * 1000
+    return {"status": status, "latency_ms": latency_ms, "result": result}
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def replay(
+    records: list[dict],
+    base_url: str,
+    capture_dir: Path,
+    speed: float = 1.0,
+    concurrency: int = 8,
+    timeout: float = 30.0,
+) -> dict:
+    """
+    Fire the captured requests at the server. With speed > 0 the original
+    inter-arrival gaps are kept (scaled by 1/speed); with speed == 0 requests
+    are sent as fast as the concurrency allows.
+    """
+    if not records:
+        return summarize(records, [], 0.0)
+
+    first_ts = records[0].get("ts", 0)
+    futures = []
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for record in records:
+            if speed > 0:
+                offset = (record.get("ts", first_ts) - first_ts) / speed
+                delay = offset - (time.perf_counter() - started)
+                if delay > 0:
+                    time.sleep(delay)
+                scheduled = started + offset
+            else:
+                scheduled = time.perf_counter()
+            request = _build_request(record, base_url, capture_dir)
+            futures.append(pool.submit(_send, request, timeout, scheduled))
+        outcomes = [f.result() for f in futures]
+
+    elapsed = time.perf_counter() - started
+    return summarize(records, outcomes, elapsed)
+
+
+def _is_error(status: Optional[int]) -> bool:
+    return status is None or status >= 400
+
+
+def summarize(records: list[dict], outcomes: list[dict], elapsed: float) -> dict:
+    """
+    Compute throughput, latency percentiles, error rates and drift against
+    the recorded results. Requests that also failed when captured are not
+    counted as new errors.
+    """
+    latencies = [o["latency_ms"] for o in outcomes]
+    errors = sum(1 for o in outcomes if _is_error(o["status"]))
+
+    status_compared = 0
+    status_mismatches = 0
+    new_errors = 0
+    for record, outcome in zip(records, outcomes):
+        recorded_status = record.get("status")
+        if recorded_status is None:
+            if _is_error(outcome["status"]):
+                new_errors += 1
+            continue
+        status_compared += 1
+        if outcome["status"] != recorded_status:
+            status_mismatches += 1
+        if _is_error(outcome["status"]) and not _is_error(recorded_status):
+            new_errors += 1
+
+    compared = 0
+    category_drift = 0
+    sub_category_drift = 0
+    for record, outcome in zip(records, outcomes):
+        if not record.get("category") or not outcome["result"]:
+            continue
+        compared += 1
+        if outcome["result"].get("category") != record["category"]:
+            category_drift += 1
+        if outcome["result"].get("sub_category") != record.get("sub_category"):
+            sub_category_drift += 1
+
+    total = len(outcomes)
+    return {
+        "requests": total,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency_p50_ms": round(percentile(latencies, 50), 2),
+        "latency_p95_ms": round(percentile(latencies, 95), 2),
+        "latency_p99_ms": round(percentile(latencies, 99), 2),
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "new_error_rate": round(new_errors / total, 4) if total else 0.0,
+        "status_mismatch_rate": round(status_mismatches / status_compared, 4) if status_compared else 0.0,
+        "compared": compared,
+        "category_drift": round(category_drift / compared, 4) if compared else 0.0,
+        "sub_category_drift": round(sub_category_drift / compared, 4) if compared else 0.0,
+    }
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def _positive_float(value: str) -> float:
+    number = float(value)
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"must be positive, got {value}")
+    return number
+
+
+def _non_negative_float(value: str) -> float:
+    number = float(value)
+    if not number >= 0:
+        raise argparse.ArgumentTypeError(f"must be zero or positive, got {value}")
+    return number
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay captured traffic against a running server.")
+    parser.add_argument("capture", help="Path to the captured JSONL file.")
+    parser.add_argument("--base-url", default="http://localhost:8000", help="Server to replay against.")
+    parser.add_argument(
+        "--speed",
+        type=_non_negative_float,
+        default=1.0,
+        help="Rate multiplier over the original arrival times (2.0 = twice as fast, 0 = no pacing).",
+    )
+    parser.add_argument("--concurrency", type=_positive_int, default=8, help="Maximum in-flight requests.")
+    parser.add_argument("--timeout", type=_positive_float, default=30.0, help="Per-request timeout in seconds.")
+    parser.add_argument("--limit", type=int, default=None, help="Replay only the first N records.")
+    args = parser.parse_args(argv)
+
+    capture_path = Path(args.capture)
+    records = load_records(capture_path)
+    if args.limit is not None:
+        records = records[: args.limit]
+
+    report = replay(
+        records,
+        args.base_url,
+        capture_path.parent,
+        speed=args.speed,
+        concurrency=args.concurrency,
+        timeout=args.timeout,
+    )
+    print(json.dumps(report, indent=2))
+    return 1 if report["new_error_rate"] > 0 else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
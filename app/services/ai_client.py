@@ -1,16 +1,28 @@
 import os
 import json
 import re
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 
 from dotenv import load_dotenv
 from openai import OpenAI
 
+from app.services.profiling import profile_in_worker
+
 load_dotenv()
 
 api_key = os.getenv("OPENAI_API_KEY")
 client = OpenAI(api_key=api_key) if api_key else None
 
+# Emails longer than MAX_CHUNK_LEN are classified in chunks of at most that size
+MAX_CHUNK_LEN = 4000
+MAX_CHUNKS = max(1, int(os.getenv("MAX_EMAIL_CHUNKS", "8")))
+
+SECURITY_SUB_CATEGORIES = (
+    "Fraude / cartão clonado",
+    "Orientação de segurança / possível golpe",
+)
+
 
 def _normalize_email_text(email_text: str) -> str:
     """
@@ -19,12 +31,80 @@ def _normalize_email_text(email_text: str) -> str:
     """
     text = email_text or ""
     text = re.sub(r"\s+", " ", text)
-    max_len = 4000
+    max_len = MAX_CHUNK_LEN
     if len(text) > max_len:
         text = text[:max_len]
     return text.strip()
 
 
+def _split_long_sentence(sentence: str, max_len: int) -> List[str]:
+    """
+    Split a sentence longer than max_len (common in unpunctuated PDF text)
+    at the last space inside each window, cutting blindly only when a
+    single word is longer than max_len.
+    """
+    parts: List[str] = []
+    while len(sentence) > max_len:
+        cut = sentence.rfind(" ", 0, max_len + 1)
+        if cut <= 0:
+            parts.append(sentence[:max_len])
+            sentence = sentence[max_len:]
+        else:
+            parts.append(sentence[:cut])
+            sentence = sentence[cut + 1 :]
+    if sentence:
+        parts.append(sentence)
+    return parts
+
+
+def _split_into_chunks(email_text: str, max_len: int = MAX_CHUNK_LEN) -> List[str]:
+    """
+    Split a long email into normalized chunks of at most max_len
+    characters, breaking on paragraphs first and sentences second.
+    Short emails come back as a single chunk.
+    """
+    pieces: List[str] = []
+    for paragraph in re.split(r"\n\s*\n", email_text or ""):
+        paragraph = re.sub(r"\s+", " ", paragraph).strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_len:
+            pieces.append(paragraph)
+            continue
+        for sentence in re.split(r"(?<=[.!?;])\s+", paragraph):
+            pieces.extend(_split_long_sentence(sentence, max_len))
+
+    chunks: List[str] = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + 1 + len(piece) > max_len:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current} {piece}" if current else piece
+    if current:
+        chunks.append(current)
+
+    return chunks or [""]
+
+
+def _merge_chunk_results(results: List[Dict[str, str]]) -> Dict[str, str]:
+    """
+    Merge per-chunk classifications into one result. Security cases
+    beat productive ones, which beat non-productive ones; ties are
+    resolved by the earliest chunk.
+    """
+
+    def rank(result):
+        if result.get("sub_category") in SECURITY_SUB_CATEGORIES:
+            return 0
+        if result.get("category") == "Produtivo":
+            return 1
+        return 2
+
+    return min(enumerate(results), key=lambda item: (rank(item[1]), item[0]))[1]
+
+
 def _detect_security_case(email_text: str) -> Optional[Dict[str, str]]:
     """
     Detect high-priority security cases (fraud or suspicious
@@ -482,19 +562,54 @@ def _rule_based_fallback(email_text: str) -> Dict[str, str]:
     }
 
 
+def _classify_long_email(chunks: List[str]) -> dict:
+    """
+    Classify an email that was split into several chunks. The security
+    check runs over every chunk first; up to MAX_CHUNKS chunks are then
+    classified concurrently and merged with a fixed precedence.
+    """
+    for chunk in chunks:
+        security_case = _detect_security_case(chunk)
+        if security_case:
+            return security_case
+
+    if len(chunks) > MAX_CHUNKS:
+        print(f"[AI_CLIENT] Email split into {len(chunks)} chunks, classifying the first {MAX_CHUNKS}.")
+        chunks = chunks[:MAX_CHUNKS]
+
+    with ThreadPoolExecutor(max_workers=len(chunks)) as pool:
+        results = list(pool.map(profile_in_worker(_classify_with_model), chunks))
+
+    return _merge_chunk_results(results)
+
+
 def classify_and_reply(email_text: str) -> dict:
     """
     Classify an email and build a suggested reply.
     Security cases are always detected first; if the model is
     unavailable or fails, a rule-based fallback is used. The same
-    normalization is applied regardless of the source.
+    normalization is applied regardless of the source. Emails longer
+    than MAX_CHUNK_LEN are classified chunk by chunk instead of being
+    truncated.
     """
+    chunks = _split_into_chunks(email_text)
+    if len(chunks) > 1:
+        return _classify_long_email(chunks)
+
     normalized_text = _normalize_email_text(email_text)
 
     security_case = _detect_security_case(normalized_text)
     if security_case:
         return security_case
 
+    return _classify_with_model(normalized_text)
+
+
+def _classify_with_model(normalized_text: str) -> dict:
+    """
+    Classify already-normalized text with the model, falling back to
+    the rule-based classifier when the model is unavailable or fails.
+    """
     if client is None or not api_key:
         print("[AI_CLIENT] No API key configured or client unavailable, using rule-based fallback.")
         return _rule_based_fallback(normalized_text)
@@ -0,0 +1,186 @@
+# app/services/profiling.py
+import contextlib
+import contextvars
+import cProfile
+import hmac
+import os
+import pstats
+import re
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from starlette.exceptions import HTTPException
+
+PROFILE_ADMIN_TOKEN = os.getenv("PROFILE_ADMIN_TOKEN", "")
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", "profiles"))
+PROFILE_HEADER = "X-Profile-Token"
+PROFILE_TOP_N = 8
+PROFILE_MAX_FILES = max(1, int(os.getenv("PROFILE_MAX_FILES", "50")))
+
+# Stage name -> (file suffix, function name) used to build the per-stage breakdown
+STAGES = {
+    "extract_txt": ("text_extractor.py", "extract_text_from_txt"),
+    "extract_pdf": ("text_extractor.py", "extract_text_from_pdf"),
+    "classify": ("ai_client.py", "classify_and_reply"),
+    "chunking": ("ai_client.py", "_split_into_chunks"),
+    "normalize": ("ai_client.py", "_normalize_email_text"),
+    "security_check": ("ai_client.py", "_detect_security_case"),
+    "model_call": ("completions.py", "create"),
+    "fallback": ("ai_client.py", "_rule_based_fallback"),
+}
+
+_PROFILE_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+# Profiler of the request being handled, so worker threads can report back to it
+_active_profiler: contextvars.ContextVar[Optional["RequestProfiler"]] = contextvars.ContextVar(
+    "active_profiler", default=None
+)
+
+
+def is_authorized(token: Optional[str]) -> bool:
+    """Check an admin token against PROFILE_ADMIN_TOKEN (profiling is off when unset)."""
+    if not PROFILE_ADMIN_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token.encode("utf-8"), PROFILE_ADMIN_TOKEN.encode("utf-8"))
+
+
+def profile_path(profile_id: str) -> Optional[Path]:
+    """Return the stored .prof file for a profile id, or None if it does not exist."""
+    if not _PROFILE_ID_RE.match(profile_id):
+        return None
+    path = PROFILE_DIR / f"{profile_id}.prof"
+    return path if path.is_file() else None
+
+
+def _prune_profiles() -> None:
+    """Delete all but the PROFILE_MAX_FILES most recent .prof files in PROFILE_DIR."""
+    profiles = sorted(PROFILE_DIR.glob("*.prof"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in profiles[PROFILE_MAX_FILES:]:
+        try:
+            old.unlink()
+        except FileNotFoundError:
+            pass  # removed concurrently by another request
+
+
+def _short_name(key: tuple) -> str:
+    filename, lineno, funcname = key
+    if filename == "~":
+        return funcname
+    return f"{Path(filename).name}:{lineno}({funcname})"
+
+
+def _stage_breakdown(stats: pstats.Stats) -> dict[str, float]:
+    """Cumulative milliseconds spent in each known pipeline stage."""
+    breakdown: dict[str, float] = {}
+    for key, (_, _, _, cumtime, _) in stats.stats.items():
+        filename, _, funcname = key
+        for stage, (suffix, name) in STAGES.items():
+            if funcname == name and filename.endswith(suffix):
+                breakdown[stage] = breakdown.get(stage, 0.0) + cumtime * 1000
+    return breakdown
+
+
+def _hot_functions(stats: pstats.Stats, limit: int = PROFILE_TOP_N) -> list[tuple[str, float]]:
+    """Functions with the highest self time, in milliseconds."""
+    entries = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+    return [(_short_name(key), tottime * 1000) for key, (_, _, tottime, _, _) in entries[:limit]]
+
+
+class RequestProfiler:
+    """
+    Profile the wrapped block with cProfile and attach a summary to the
+    response headers (or to the HTTPException raised by the block). The
+    full stats are stored under PROFILE_DIR, which keeps the latest
+    PROFILE_MAX_FILES profiles, and can be downloaded from
+    /debug/profiles/{id}. Work handed to other threads is included when
+    wrapped with profile_in_worker.
+    """
+
+    def __init__(self, response):
+        self.response = response
+        self.profile_id = uuid.uuid4().hex
+        self.profiler = cProfile.Profile()
+        self.worker_profiles: list[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self._token = _active_profiler.set(self)
+        self._started = time.perf_counter()
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.disable()
+        self.wall_ms = (time.perf_counter() - self._started) * 1000
+        _active_profiler.reset(self._token)
+        try:
+            profile_headers = self._publish()
+        except Exception as e:
+            print(f"[PROFILING] Could not publish profile ({type(e).__name__}): {e}")
+            return False
+
+        # Error responses are built from the exception, not from the injected response
+        if isinstance(exc, HTTPException):
+            exc.headers = {**(exc.headers or {}), **profile_headers}
+        else:
+            self.response.headers.update(profile_headers)
+        return False
+
+    def _publish(self) -> dict[str, str]:
+        stats = pstats.Stats(self.profiler)
+        with self._lock:
+            for worker_profile in self.worker_profiles:
+                stats.add(worker_profile)
+
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        stats.dump_stats(str(PROFILE_DIR / f"{self.profile_id}.prof"))
+        _prune_profiles()
+
+        stages = _stage_breakdown(stats)
+        hot = _hot_functions(stats)
+
+        # Stage times are summed across worker threads, so they can exceed the wall time
+        return {
+            "X-Profile-Id": self.profile_id,
+            "X-Profile-Total-Ms": f"{self.wall_ms:.2f}",
+            "X-Profile-Workers": str(len(self.worker_profiles)),
+            "X-Profile-Stages": ", ".join(f"{k}={v:.2f}ms" for k, v in stages.items()),
+            "X-Profile-Top": ", ".join(f"{name}={ms:.2f}ms" for name, ms in hot),
+        }
+
+
+def profile_request(request, response):
+    """
+    Return a profiler context for admin requests carrying a valid
+    X-Profile-Token header, or a no-op context for everything else.
+    """
+    token = request.headers.get(PROFILE_HEADER)
+    if token is None or not is_authorized(token):
+        return contextlib.nullcontext()
+    return RequestProfiler(response)
+
+
+def profile_in_worker(fn):
+    """
+    Wrap a function that will run in a worker thread so its profile is
+    merged into the current request profile. Returns fn unchanged when
+    the request is not being profiled.
+    """
+    request_profiler = _active_profiler.get()
+    if request_profiler is None:
+        return fn
+
+    def wrapper(*args, **kwargs):
+        worker_profile = cProfile.Profile()
+        worker_profile.enable()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            worker_profile.disable()
+            with request_profiler._lock:
+                request_profiler.worker_profiles.append(worker_profile)
+
+    return wrapper
@@ -0,0 +1,92 @@
+# app/services/static_assets.py
+import json
+import mimetypes
+import stat
+from pathlib import Path
+from typing import Optional
+
+import anyio
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+
+STATIC_DIR = Path("static")
+DIST_DIR = "dist"
+MANIFEST_NAME = "manifest.json"
+
+# Content-hashed files never change, so browsers may keep them forever
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+
+# Preferred order when the client accepts several encodings
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+_manifests: dict[Path, dict] = {}
+
+
+def load_manifest(static_dir: Path = STATIC_DIR) -> dict:
+    """Load the asset manifest written by `python -m app.build_static` (empty if not built)."""
+    static_dir = Path(static_dir)
+    if static_dir not in _manifests:
+        try:
+            manifest = json.loads((static_dir / DIST_DIR / MANIFEST_NAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            manifest = {}
+        _manifests[static_dir] = manifest
+    return _manifests[static_dir]
+
+
+def asset_url(name: str) -> str:
+    """Public URL of a static asset, pointing to its content-hashed build when available."""
+    return "/static/" + load_manifest().get(name, name)
+
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+    """Parse an Accept-Encoding header, ignoring codings explicitly refused with q=0."""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        if coding:
+            accepted.add(coding.strip())
+    return accepted
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves prebuilt .br / .gz siblings according to
+    Accept-Encoding and marks the content-hashed builds listed in the
+    manifest as immutable.
+    """
+
+    async def get_response(self, path: str, scope):
+        response = None
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+
+        for encoding, suffix in ENCODINGS:
+            # Other methods fall through to StaticFiles, which answers 405
+            if scope["method"] not in ("GET", "HEAD") or encoding not in accepted:
+                continue
+            full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path + suffix)
+            if stat_result and stat.S_ISREG(stat_result.st_mode):
+                response = self.file_response(full_path, stat_result, scope)
+                media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+                if media_type.startswith("text/") or media_type.endswith("javascript"):
+                    media_type += "; charset=utf-8"
+                response.headers["content-type"] = media_type
+                response.headers["content-encoding"] = encoding
+                break
+
+        if response is None:
+            response = await super().get_response(path, scope)
+
+        if response.status_code in (200, 304):
+            hashed = path in load_manifest(Path(self.directory)).values()
+            response.headers["cache-control"] = IMMUTABLE_CACHE if hashed else REVALIDATE_CACHE
+            response.headers["vary"] = "Accept-Encoding"
+        return response
@@ -0,0 +1,152 @@
+# app/services/traffic_capture.py
+import asyncio
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+CAPTURE_ENABLED = os.getenv("TRAFFIC_CAPTURE_ENABLED", "").lower() in ("1", "true", "yes")
+CAPTURE_PATH = os.getenv("TRAFFIC_CAPTURE_PATH", "captures/traffic.jsonl")
+CAPTURE_SAMPLE_RATE = float(os.getenv("TRAFFIC_CAPTURE_SAMPLE_RATE", "0.1"))
+
+# Only the analysis endpoints are worth replaying
+CAPTURED_PATHS = ("/analyze-text", "/analyze-file")
+
+_write_lock = threading.Lock()
+
+
+def _store_body(body: bytes, capture_dir: Path) -> str:
+    """Store a raw upload body next to the capture file and return its relative reference."""
+    bodies_dir = capture_dir / "bodies"
+    bodies_dir.mkdir(parents=True, exist_ok=True)
+    name = hashlib.sha256(body).hexdigest() + ".bin"
+    target = bodies_dir / name
+    if not target.exists():
+        target.write_bytes(body)
+    return f"bodies/{name}"
+
+
+def _append_record(record: dict, capture_path: Path) -> None:
+    """Append a single JSON line to the capture file."""
+    line = json.dumps(record, ensure_ascii=False)
+    with _write_lock:
+        capture_path.parent.mkdir(parents=True, exist_ok=True)
+        with capture_path.open("a", encoding="utf-8") as fh:
+            fh.write(line + "\n")
+
+
+def _build_record(
+    path: str,
+    arrival: float,
+    latency_ms: float,
+    status: int,
+    content_type: str,
+    request_body: bytes,
+    response_body: bytes,
+    capture_dir: Path,
+) -> dict:
+    """Build the JSONL record for one captured request/response pair."""
+    record = {
+        "ts": arrival,
+        "endpoint": path,
+        "status": status,
+        "latency_ms": round(latency_ms, 2),
+        "content_type": content_type,
+    }
+
+    # Request bodies are kept verbatim, even invalid ones, so the replay sends the same bytes
+    body_text = None
+    if path == "/analyze-text":
+        try:
+            body_text = request_body.decode("utf-8")
+        except UnicodeDecodeError:
+            pass
+
+    if body_text is not None:
+        record["body"] = body_text
+    else:
+        # Multipart uploads and non-UTF-8 bodies are stored as files
+        record["file"] = _store_body(request_body, capture_dir)
+
+    try:
+        result = json.loads(response_body or b"{}")
+    except ValueError:
+        result = {}
+    if isinstance(result, dict):
+        record["category"] = result.get("category")
+        record["sub_category"] = result.get("sub_category")
+
+    return record
+
+
+class TrafficCaptureMiddleware:
+    """
+    ASGI middleware that records a sample of analysis requests to JSONL
+    so they can be replayed later with `python -m app.replay`.
+    """
+
+    def __init__(
+        self,
+        app,
+        capture_path: str = CAPTURE_PATH,
+        sample_rate: float = CAPTURE_SAMPLE_RATE,
+    ):
+        self.app = app
+        self.capture_path = Path(capture_path)
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope.get("method") != "POST"
+            or scope.get("path") not in CAPTURED_PATHS
+            or random.random() >= self.sample_rate
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        arrival = time.time()
+        started = time.perf_counter()
+        request_chunks: list[bytes] = []
+        response_chunks: list[bytes] = []
+        status: Optional[int] = None
+
+        async def receive_wrapper():
+            message = await receive()
+            if message["type"] == "http.request":
+                request_chunks.append(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_chunks.append(message.get("body", b""))
+            await send(message)
+
+        await self.app(scope, receive_wrapper, send_wrapper)
+
+        latency_ms = (time.perf_counter() - started) * 1000
+        headers = dict(scope.get("headers") or [])
+        content_type = headers.get(b"content-type", b"").decode("latin-1")
+
+        try:
+            record = await asyncio.to_thread(
+                _build_record,
+                scope["path"],
+                arrival,
+                latency_ms,
+                status or 500,
+                content_type,
+                b"".join(request_chunks),
+                b"".join(response_chunks),
+                self.capture_path.parent,
+            )
+            await asyncio.to_thread(_append_record, record, self.capture_path)
+        except Exception as e:
+            print(f"[TRAFFIC_CAPTURE] Could not record request ({type(e).__name__}): {e}")
@@ -0,0 +1,117 @@
+import pytest
+
+from app.services import ai_client
+from app.services.ai_client import _merge_chunk_results, _split_into_chunks, classify_and_reply
+
+FRAUD = {"category": "Produtivo", "sub_category": "Fraude / cartão clonado"}
+SCAM = {"category": "Produtivo", "sub_category": "Orientação de segurança / possível golpe"}
+LIMIT = {"category": "Produtivo", "sub_category": "Gestão de limite do cartão"}
+INVOICE = {"category": "Produtivo", "sub_category": "Fatura / cobrança / lançamentos"}
+COURTESY = {"category": "Improdutivo", "sub_category": "Mensagem de cortesia / felicitação"}
+OUT_OF_SCOPE = {"category": "Improdutivo", "sub_category": "Mensagem informativa / fora de escopo"}
+
+FILLER = "Texto informativo sem nenhum pedido. " * 120
+
+
+@pytest.fixture
+def rule_based(monkeypatch):
+    """Force the rule-based fallback so classification does not call the model."""
+    monkeypatch.setattr(ai_client, "client", None)
+
+
+def test_short_email_is_a_single_normalized_chunk():
+    assert _split_into_chunks("  Olá,\n\n  quero   ajuda.  ") == ["Olá, quero ajuda."]
+
+
+def test_empty_email_is_a_single_empty_chunk():
+    assert _split_into_chunks("") == [""]
+    assert _split_into_chunks(None) == [""]
+
+
+def test_paragraphs_are_packed_until_max_len():
+    text = "a" * 10 + "\n\n" + "b" * 10 + "\n\n" + "c" * 10
+    assert _split_into_chunks(text, max_len=21) == ["a" * 10 + " " + "b" * 10, "c" * 10]
+
+
+def test_paragraph_fits_exactly_in_max_len():
+    assert _split_into_chunks("a" * 20, max_len=20) == ["a" * 20]
+
+
+def test_long_paragraph_is_split_on_sentences():
+    text = "Primeira frase aqui. Segunda frase aqui! Terceira frase aqui?"
+    assert _split_into_chunks(text, max_len=25) == [
+        "Primeira frase aqui.",
+        "Segunda frase aqui!",
+        "Terceira frase aqui?",
+    ]
+
+
+def test_sentence_longer_than_max_len_is_hard_cut():
+    assert _split_into_chunks("x" * 25, max_len=10) == ["x" * 10, "x" * 10, "x" * 5]
+
+
+def test_long_sentence_is_split_on_whitespace():
+    assert _split_into_chunks("aaaa bbbb cccc dddd", max_len=10) == ["aaaa bbbb", "cccc dddd"]
+
+
+def test_long_unpunctuated_text_does_not_split_words():
+    words = [f"palavra{i}" for i in range(200)]
+    chunks = _split_into_chunks(" ".join(words), max_len=100)
+
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    assert " ".join(chunks).split() == words
+
+
+def test_chunks_never_exceed_max_len():
+    text = "\n\n".join(["Frase de teste. " * 40] * 5)
+    chunks = _split_into_chunks(text, max_len=300)
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 300 for chunk in chunks)
+
+
+def test_security_beats_productive_and_non_productive():
+    assert _merge_chunk_results([OUT_OF_SCOPE, LIMIT, SCAM]) is SCAM
+
+
+def test_productive_beats_non_productive():
+    assert _merge_chunk_results([COURTESY, OUT_OF_SCOPE, INVOICE]) is INVOICE
+
+
+def test_ties_go_to_the_earliest_chunk():
+    assert _merge_chunk_results([COURTESY, SCAM, FRAUD]) is SCAM
+    assert _merge_chunk_results([OUT_OF_SCOPE, INVOICE, LIMIT]) is INVOICE
+    assert _merge_chunk_results([OUT_OF_SCOPE, COURTESY]) is OUT_OF_SCOPE
+
+
+def test_single_chunk_result_is_returned_as_is():
+    assert _merge_chunk_results([COURTESY]) is COURTESY
+
+
+def test_productive_request_past_4000_chars_is_classified_produtivo(rule_based):
+    text = FILLER + "\n\n" + FILLER + "\n\nQuero aumento de limite do cartão, por favor."
+    assert len(text) > 4000
+
+    result = classify_and_reply(text)
+
+    assert result["category"] == "Produtivo"
+    assert result["sub_category"] == "Gestão de limite do cartão"
+
+
+def test_security_case_after_max_chunks_is_detected(rule_based, monkeypatch):
+    monkeypatch.setattr(ai_client, "MAX_CHUNKS", 2)
+    text = "\n\n".join([FILLER] * 4) + "\n\ncompra que nao fiz no cartao clonado"
+    assert len(_split_into_chunks(text)) > 2
+
+    result = classify_and_reply(text)
+
+    assert result["sub_category"] == "Fraude / cartão clonado"
+
+
+def test_long_non_productive_email_stays_improdutivo(rule_based):
+    result = classify_and_reply("\n\n".join([FILLER] * 3))
+
+    assert result["category"] == "Improdutivo"
+
+
+def test_short_email_uses_single_path(rule_based):
+    assert classify_and_reply("Feliz natal!")["sub_category"] == "Mensagem de cortesia / felicitação"
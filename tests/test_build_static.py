@@ -0,0 +1,46 @@
+import os
+import shutil
+from pathlib import Path
+
+from app.build_static import ASSETS, build
+
+
+def _copy_assets(static_dir: Path) -> None:
+    for name in ASSETS:
+        (static_dir / name).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy(Path("static") / name, static_dir / name)
+
+
+def _age_builds(static_dir: Path) -> None:
+    """Push every existing build back in time so the next one is clearly newer."""
+    for path in (static_dir / "dist").rglob("*"):
+        if path.is_file():
+            stat = path.stat()
+            os.utime(path, (stat.st_atime - 3600, stat.st_mtime - 3600))
+
+
+def test_build_writes_manifest_and_compressed_variants(tmp_path):
+    _copy_assets(tmp_path)
+
+    manifest = build(tmp_path)
+
+    for name in ASSETS:
+        built = tmp_path / manifest[name]
+        assert built.read_bytes() == (tmp_path / name).read_bytes()
+        assert built.with_name(built.name + ".gz").is_file()
+    assert (tmp_path / "dist" / "manifest.json").is_file()
+
+
+def test_build_keeps_previous_builds_and_prunes_old_ones(tmp_path):
+    _copy_assets(tmp_path)
+    css = tmp_path / "css" / "styles.css"
+
+    builds = []
+    for i in range(4):
+        css.write_text(f"body {{ order: {i}; }}")
+        _age_builds(tmp_path)
+        builds.append(tmp_path / build(tmp_path, keep=3)["css/styles.css"])
+
+    assert not builds[0].exists()
+    assert not builds[0].with_name(builds[0].name + ".gz").exists()
+    assert all(path.exists() for path in builds[1:])
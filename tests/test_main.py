@@ -0,0 +1,72 @@
+import shutil
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.build_static import ASSETS, build
+from app.main import app
+from app.services.static_assets import PrecompressedStaticFiles
+
+client = TestClient(app)
+
+
+def test_landing_page_etag_differs_per_content_coding():
+    plain = client.get("/", headers={"Accept-Encoding": "identity"})
+    gzipped = client.get("/", headers={"Accept-Encoding": "gzip"})
+
+    assert plain.status_code == gzipped.status_code == 200
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["etag"] != gzipped.headers["etag"]
+    assert plain.text == gzipped.text
+
+
+def test_landing_page_revalidates_with_matching_etag():
+    etag = client.get("/", headers={"Accept-Encoding": "gzip"}).headers["etag"]
+
+    assert client.get("/", headers={"Accept-Encoding": "gzip", "If-None-Match": etag}).status_code == 304
+    assert client.get("/", headers={"Accept-Encoding": "identity", "If-None-Match": etag}).status_code == 200
+
+
+def test_landing_page_if_none_match_star():
+    assert client.get("/", headers={"If-None-Match": "*"}).status_code == 304
+
+
+def _static_client(tmp_path):
+    for name in ASSETS:
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy(Path("static") / name, tmp_path / name)
+    manifest = build(tmp_path)
+
+    static_app = FastAPI()
+    static_app.mount("/static", PrecompressedStaticFiles(directory=tmp_path), name="static")
+    return TestClient(static_app), manifest
+
+
+def test_hashed_assets_are_precompressed_and_immutable(tmp_path):
+    static_client, manifest = _static_client(tmp_path)
+    url = "/static/" + manifest["css/styles.css"]
+
+    response = static_client.get(url, headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"].startswith("text/css")
+    assert "immutable" in response.headers["cache-control"]
+
+
+def test_manifest_is_not_immutable(tmp_path):
+    static_client, _ = _static_client(tmp_path)
+
+    response = static_client.get("/static/dist/manifest.json")
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "no-cache"
+
+
+def test_precompressed_variant_rejects_post(tmp_path):
+    static_client, manifest = _static_client(tmp_path)
+    url = "/static/" + manifest["js/app.js"]
+
+    assert static_client.post(url, headers={"Accept-Encoding": "gzip"}).status_code == 405
@@ -0,0 +1,98 @@
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import ai_client, profiling
+
+TOKEN = "test-admin-token"
+PROFILE_HEADERS = ("x-profile-id", "x-profile-total-ms", "x-profile-stages", "x-profile-top")
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def profiling_enabled(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_ADMIN_TOKEN", TOKEN)
+    monkeypatch.setattr(profiling, "PROFILE_DIR", tmp_path)
+    monkeypatch.setattr(ai_client, "client", None)
+
+
+def test_no_token_means_no_profile_headers():
+    response = client.post("/analyze-text", json={"text": "Feliz natal!"})
+
+    assert response.status_code == 200
+    assert not any(h in response.headers for h in PROFILE_HEADERS)
+
+
+def test_wrong_token_means_no_profile_headers():
+    response = client.post(
+        "/analyze-text", json={"text": "Feliz natal!"}, headers={"X-Profile-Token": "wrong"}
+    )
+
+    assert not any(h in response.headers for h in PROFILE_HEADERS)
+
+
+def test_valid_token_adds_profile_headers(tmp_path):
+    response = client.post(
+        "/analyze-text", json={"text": "Feliz natal!"}, headers={"X-Profile-Token": TOKEN}
+    )
+
+    assert response.status_code == 200
+    assert all(h in response.headers for h in PROFILE_HEADERS)
+    assert "classify=" in response.headers["x-profile-stages"]
+    assert (tmp_path / f"{response.headers['x-profile-id']}.prof").is_file()
+
+
+def test_valid_token_adds_profile_headers_on_http_exception():
+    response = client.post(
+        "/analyze-file",
+        files={"file": ("email.doc", b"conteudo", "application/msword")},
+        headers={"X-Profile-Token": TOKEN},
+    )
+
+    assert response.status_code == 400
+    assert all(h in response.headers for h in PROFILE_HEADERS)
+
+
+def test_chunk_workers_are_merged_into_the_profile():
+    text = "\n\n".join(["Texto informativo sem nenhum pedido. " * 120] * 3)
+
+    response = client.post("/analyze-text", json={"text": text}, headers={"X-Profile-Token": TOKEN})
+
+    assert int(response.headers["x-profile-workers"]) > 1
+    assert "fallback=" in response.headers["x-profile-stages"]
+
+
+def test_profile_download_requires_token():
+    profile_id = client.post(
+        "/analyze-text", json={"text": "Feliz natal!"}, headers={"X-Profile-Token": TOKEN}
+    ).headers["x-profile-id"]
+    url = f"/debug/profiles/{profile_id}"
+
+    assert client.get(url).status_code == 404
+    assert client.get(url, headers={"X-Profile-Token": "wrong"}).status_code == 404
+    assert client.get(url, headers={"X-Profile-Token": TOKEN}).status_code == 200
+
+
+def test_profile_download_rejects_unknown_ids():
+    assert client.get("/debug/profiles/../secret", headers={"X-Profile-Token": TOKEN}).status_code == 404
+    assert client.get("/debug/profiles/" + "0" * 32, headers={"X-Profile-Token": TOKEN}).status_code == 404
+
+
+def test_profile_directory_is_capped(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_MAX_FILES", 2)
+    for i in range(3):
+        stale = tmp_path / f"{i:032x}.prof"
+        stale.write_bytes(b"")
+        os.utime(stale, (i, i))
+
+    response = client.post(
+        "/analyze-text", json={"text": "Feliz natal!"}, headers={"X-Profile-Token": TOKEN}
+    )
+
+    remaining = sorted(p.name for p in tmp_path.glob("*.prof"))
+    assert len(remaining) == 2
+    assert f"{response.headers['x-profile-id']}.prof" in remaining
+    assert f"{2:032x}.prof" in remaining
@@ -0,0 +1,193 @@
+import json
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from app.replay import _build_request, _send, main, percentile, summarize
+from app.services.traffic_capture import _build_record
+
+
+def _record(tmp_path, path, request_body, status=200, response_body=b"{}", content_type="application/json"):
+    return _build_record(path, 1.0, 12.5, status, content_type, request_body, response_body, tmp_path)
+
+
+def _outcome(status, result=None, latency_ms=10.0):
+    return {"status": status, "latency_ms": latency_ms, "result": result or {}}
+
+
+def test_text_request_body_is_kept_verbatim(tmp_path):
+    record = _record(tmp_path, "/analyze-text", b'{"bad":1}', status=422)
+
+    assert record["body"] == '{"bad":1}'
+    assert record["status"] == 422
+    assert "file" not in record
+
+    request = _build_request(record, "http://localhost:8000", tmp_path)
+    assert request.data == b'{"bad":1}'
+    assert request.get_header("Content-type") == "application/json"
+
+
+def test_multipart_body_is_stored_as_file(tmp_path):
+    body = b"--a\r\ncontent\r\n--a--"
+    record = _record(tmp_path, "/analyze-file", body, content_type="multipart/form-data; boundary=a")
+
+    assert (tmp_path / record["file"]).read_bytes() == body
+    request = _build_request(record, "http://localhost:8000/", tmp_path)
+    assert request.full_url == "http://localhost:8000/analyze-file"
+    assert request.data == body
+    assert request.get_header("Content-type") == "multipart/form-data; boundary=a"
+
+
+def test_record_keeps_recorded_classification(tmp_path):
+    response = json.dumps({"category": "Produtivo", "sub_category": "Gestão de limite do cartão"}).encode()
+    record = _record(tmp_path, "/analyze-text", b'{"text": "limite"}', response_body=response)
+
+    assert record["category"] == "Produtivo"
+    assert record["sub_category"] == "Gestão de limite do cartão"
+
+
+def test_record_ignores_non_json_response(tmp_path):
+    record = _record(tmp_path, "/analyze-text", b'{"text": "oi"}', status=500, response_body=b"oops")
+
+    assert record.get("category") is None
+
+
+def test_originally_failing_requests_are_not_new_errors():
+    records = [{"status": 422}, {"status": 200}]
+    outcomes = [_outcome(422), _outcome(200)]
+
+    report = summarize(records, outcomes, 1.0)
+
+    assert report["error_rate"] == 0.5
+    assert report["new_error_rate"] == 0.0
+    assert report["status_mismatch_rate"] == 0.0
+
+
+def test_status_changes_are_reported():
+    records = [{"status": 422}, {"status": 200}]
+    outcomes = [_outcome(200), _outcome(500)]
+
+    report = summarize(records, outcomes, 1.0)
+
+    assert report["error_rate"] == 0.5
+    assert report["new_error_rate"] == 0.5
+    assert report["status_mismatch_rate"] == 1.0
+
+
+def test_transport_errors_count_as_new_errors():
+    report = summarize([{"status": 200}], [_outcome(None)], 1.0)
+
+    assert report["new_error_rate"] == 1.0
+
+
+@pytest.fixture
+def plain_text_server():
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            self.send_response(200)
+            self.end_headers()
+            self.wfile.write(b"not json")
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_send_keeps_status_for_non_json_body(plain_text_server):
+    request = urllib.request.Request(plain_text_server, data=b"{}", method="POST")
+
+    outcome = _send(request, 5.0, time.perf_counter())
+
+    assert outcome["status"] == 200
+    assert outcome["result"] == {}
+
+
+def test_send_measures_latency_from_scheduled_time(plain_text_server):
+    request = urllib.request.Request(plain_text_server, data=b"{}", method="POST")
+
+    # Scheduled half a second ago, e.g. while queued behind busy workers
+    outcome = _send(request, 5.0, time.perf_counter() - 0.5)
+
+    assert outcome["latency_ms"] >= 500
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([3.0, 1.0, 2.0], 100) == 3.0
+
+
+def test_percentile_edge_cases():
+    assert percentile([], 95) == 0.0
+    assert percentile([7.0], 0) == 7.0
+
+
+def test_summarize_latency_throughput_and_drift():
+    records = [
+        {"status": 200, "category": "Produtivo", "sub_category": "A"},
+        {"status": 200, "category": "Produtivo", "sub_category": "A"},
+        {"status": 200, "category": "Improdutivo", "sub_category": "B"},
+        {"status": 200},
+    ]
+    outcomes = [
+        _outcome(200, {"category": "Produtivo", "sub_category": "A"}, latency_ms=10.0),
+        _outcome(200, {"category": "Produtivo", "sub_category": "C"}, latency_ms=20.0),
+        _outcome(200, {"category": "Produtivo", "sub_category": "A"}, latency_ms=30.0),
+        _outcome(200, {"category": "Produtivo"}, latency_ms=40.0),
+    ]
+
+    report = summarize(records, outcomes, 2.0)
+
+    assert report["requests"] == 4
+    assert report["throughput_rps"] == 2.0
+    assert report["latency_p50_ms"] == 20.0
+    assert report["latency_p99_ms"] == 40.0
+    assert report["compared"] == 3
+    assert report["category_drift"] == round(1 / 3, 4)
+    assert report["sub_category_drift"] == round(2 / 3, 4)
+
+
+def test_summarize_non_json_success_is_not_an_error():
+    report = summarize([{"status": 200, "category": "Produtivo"}], [_outcome(200)], 1.0)
+
+    assert report["error_rate"] == 0.0
+    assert report["compared"] == 0
+
+
+def test_summarize_empty_run():
+    report = summarize([], [], 0.0)
+
+    assert report["requests"] == 0
+    assert report["throughput_rps"] == 0.0
+    assert report["error_rate"] == 0.0
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["--concurrency", "0"],
+        ["--concurrency", "-2"],
+        ["--speed", "-1"],
+        ["--speed", "nan"],
+        ["--timeout", "0"],
+    ],
+)
+def test_main_rejects_invalid_arguments(tmp_path, args):
+    capture = tmp_path / "traffic.jsonl"
+    capture.write_text("")
+
+    with pytest.raises(SystemExit) as excinfo:
+        main([str(capture), *args])
+    assert excinfo.value.code == 2